@@ -69,7 +69,7 @@ import asyncio
 import psutil
 from pathlib import Path
 from typing import Dict, Optional, AsyncGenerator, Callable, Any, TYPE_CHECKING
-from contextlib import contextmanager, asynccontextmanager
+from contextlib import asynccontextmanager, contextmanager
 from enum import Enum
 
 # ============================================================================
@@ -83,19 +83,14 @@ logger = logging.getLogger("studio-sync")
 logging.getLogger("demucs").setLevel(logging.DEBUG)
 
 
-@contextmanager
-def suppress_c_stderr():
-    """Context manager to suppress stderr from C libraries like libmpg123"""
-    stderr_fd = sys.stderr.fileno()
-    saved_stderr = os.dup(stderr_fd)
-    try:
-        devnull = os.open(os.devnull, os.O_WRONLY)
-        os.dup2(devnull, stderr_fd)
-        os.close(devnull)
+# Shared with the splitter so the tty check and env override stay in one place.
+# The API still starts without the splitter (see below), just without suppression.
+try:
+    from scripts.audio_splitter import suppress_c_stderr
+except ImportError:
+    @contextmanager
+    def suppress_c_stderr():
         yield
-    finally:
-        os.dup2(saved_stderr, stderr_fd)
-        os.close(saved_stderr)
 
 
 # ============================================================================
@@ -379,8 +374,7 @@ async def lifespan(app: FastAPI):
     logger.info("Studio Sync API shutting down...")
     global _splitter_engines
     for engine in _splitter_engines.values():
-        if hasattr(engine, 'device') and engine.device and engine.device.type == "cuda":
-            torch.cuda.empty_cache()
+        engine.release()
     logger.info("Goodbye!")
 
 
@@ -735,7 +729,10 @@ async def split_youtube_stream(
             def cb(pct, stage):
                 streamer.send_progress(pct, stage)
             
-            split_result = engine.split_audio(
+            # Off the event loop: split_audio blocks, and waits for any split
+            # already running on this engine
+            split_result = await asyncio.to_thread(
+                engine.split_audio,
                 file_path,
                 progress_callback=cb,
                 check_cache=True,
@@ -830,7 +827,10 @@ async def split_audio_endpoint(
         def log_progress(pct: int, stage: str):
             logger.info(f"Progress: {pct}% - {stage}")
         
-        result = engine.split_audio(
+        # Off the event loop: split_audio blocks, and waits for any split
+        # already running on this engine
+        result = await asyncio.to_thread(
+            engine.split_audio,
             str(file_path),
             progress_callback=log_progress,
             check_cache=True,
@@ -4,7 +4,9 @@ Audio Splitter Engine - Professional stem separation with caching support
 """
 import os
 import sys
+import math
 import hashlib
+import threading
 
 # Prevent OpenMP thread-locking on Apple Silicon
 os.environ["OMP_NUM_THREADS"] = "1"
@@ -12,18 +14,37 @@ os.environ["MKL_NUM_THREADS"] = "1"
 os.environ["OPENBLAS_NUM_THREADS"] = "1"
 
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Callable, Optional, Tuple
+from importlib.util import find_spec
+from typing import Dict, Iterator, List, Callable, Optional, Tuple, TYPE_CHECKING
 
 # ============================================================================
 # Configure logging
 # ============================================================================
 logger = logging.getLogger("studio-sync.splitter")
 
+# Decided once at import; see suppress_c_stderr
+_SUPPRESS_STDERR = (
+    os.environ.get("STUDIO_SYNC_SUPPRESS_STDERR", "1") != "0"
+    and sys.stderr is not None
+    and sys.stderr.isatty()
+)
+
+
 @contextmanager
 def suppress_c_stderr():
-    """Context manager to suppress stderr from C libraries like libmpg123"""
+    """
+    Context manager to suppress stderr from C libraries like libmpg123
+    
+    Only active when stderr is a terminal (redirected logs are left alone) and
+    STUDIO_SYNC_SUPPRESS_STDERR is not "0". Not thread-safe: dup2 swaps the
+    process-wide fd 2, hiding stderr output from every thread while active.
+    """
+    if not _SUPPRESS_STDERR:
+        yield
+        return
     stderr_fd = sys.stderr.fileno()
     saved_stderr = os.dup(stderr_fd)
     try:
@@ -55,27 +76,143 @@ def compute_file_hash(file_path: str, chunk_size: int = 8192) -> str:
 
 
 # ============================================================================
-# Heavy imports (after environment setup)
+# Imports (after environment setup)
 # ============================================================================
+# numpy and soundfile are cheap and needed for metadata queries; torch, librosa
+# and demucs are imported where they're used so get_stem_info and mock runs
+# don't pay seconds of import time and hundreds of MB of RSS.
 import numpy as np
 import soundfile as sf
-import torch
-import librosa
-
-# Demucs imports with error handling
-try:
-    from demucs.pretrained import get_model
-    from demucs.apply import apply_model
-    DEMUCS_AVAILABLE = True
-    logger.info("✅ Demucs library loaded successfully")
-except ImportError as e:
-    logger.error(f"❌ Demucs not available: {e}")
+
+if TYPE_CHECKING:
+    import torch
+
+# Detect demucs without importing it
+DEMUCS_AVAILABLE = find_spec("demucs") is not None and find_spec("torch") is not None
+if DEMUCS_AVAILABLE:
+    logger.info("✅ Demucs library found")
+else:
+    logger.error("❌ Demucs not available")
     logger.error("   Install with: pip install demucs")
-    DEMUCS_AVAILABLE = False
+
+
+# Guards _MODEL_CACHE, _MODEL_USERS and _ENGINE_CACHE
+_ENGINE_CACHE_LOCK = threading.Lock()
+# Pretrained demucs models keyed by name, and how many engines hold each
+# (see _get_model, _release_model)
+_MODEL_CACHE: Dict[str, object] = {}
+_MODEL_USERS: Dict[str, int] = {}
+
+
+def _get_model(model_name: str):
+    """
+    Load pretrained demucs weights once per process and count the caller as a user
+    
+    Engines for the same model name share the returned module; it is moved to
+    the inference device in place, which is idempotent across engines. Loading
+    happens under _ENGINE_CACHE_LOCK, so concurrent engines load a model once.
+    Each call must be paired with _release_model.
+    """
+    with _ENGINE_CACHE_LOCK:
+        model = _MODEL_CACHE.get(model_name)
+        if model is None:
+            from demucs.pretrained import get_model
+            model = _MODEL_CACHE[model_name] = get_model(model_name)
+        _MODEL_USERS[model_name] = _MODEL_USERS.get(model_name, 0) + 1
+        return model
+
+
+def _release_model(model_name: str):
+    """Drop one user of a cached model, evicting its weights after the last one"""
+    with _ENGINE_CACHE_LOCK:
+        users = _MODEL_USERS.get(model_name, 0) - 1
+        if users > 0:
+            _MODEL_USERS[model_name] = users
+        else:
+            _MODEL_USERS.pop(model_name, None)
+            _MODEL_CACHE.pop(model_name, None)
+
+
+def _resample(y: np.ndarray, sr_native: int, sr_target: int) -> np.ndarray:
+    """
+    Resample a (samples, channels) array with SoX's polyphase resampler
+    
+    Falls back to librosa.resample if the soxr package isn't installed.
+    """
+    try:
+        import soxr
+    except ImportError:
+        import librosa
+        return librosa.resample(y.T, orig_sr=sr_native, target_sr=sr_target).T
+    return soxr.resample(y, sr_native, sr_target, quality="HQ")
+
+
+def _fast_load(path: str, sr_target: Optional[int] = None, mono: bool = False) -> Tuple[np.ndarray, int]:
+    """
+    Decode audio straight through libsndfile, resampling only when needed
+    
+    Drop-in for librosa.load(path, sr=sr_target, mono=mono): returns float32
+    audio shaped (channels, samples), or (samples,) when mono or single-channel.
+    Containers libsndfile can't decode (e.g. m4a) fall back to librosa/audioread.
+    
+    Args:
+        path: Path to audio file
+        sr_target: Output sample rate (None keeps the native rate)
+        mono: Mix down to a single channel
+        
+    Returns:
+        Tuple of (audio, sample_rate)
+    """
+    try:
+        y, sr = sf.read(path, dtype="float32", always_2d=True)
+    except sf.LibsndfileError:
+        import librosa
+        with suppress_c_stderr():
+            return librosa.load(path, sr=sr_target, mono=mono)
+    
+    if mono:
+        y = y.mean(axis=1, keepdims=True)
+    
+    if sr_target is not None and sr_target != sr:
+        y = _resample(y, sr, sr_target)
+        sr = sr_target
+    
+    if y.shape[1] == 1:
+        return np.ascontiguousarray(y[:, 0]), sr
+    return np.ascontiguousarray(y.T), sr
+
+
+def _maybe_empty_cache(device, threshold: float = 0.8):
+    """
+    Return cached CUDA blocks to the driver only when the device is nearly full
+    
+    torch.cuda.empty_cache() synchronizes and forces later re-allocation, while
+    the caching allocator would otherwise reuse those blocks on the next split.
+    
+    Args:
+        device: torch.device the engine runs on (None or non-CUDA is a no-op)
+        threshold: Fraction of total device memory in use that triggers a flush
+    """
+    if device is None or device.type != "cuda":
+        return
+    
+    import torch
+    
+    free, total = torch.cuda.mem_get_info(device)
+    if total - free > threshold * total:
+        torch.cuda.empty_cache()
 
 
 class SplitterEngine:
-    """Professional audio stem separation engine with UI integration hooks"""
+    """
+    Professional audio stem separation engine with UI integration hooks
+    
+    On CUDA, model initialization defaults PYTORCH_CUDA_ALLOC_CONF to
+    expandable segments so chunked inference doesn't fragment the caching
+    allocator. The variable is only read when the first CUDA allocation is
+    made; set it in the environment to override, or create the engine before
+    anything else touches the GPU.
+    """
     
     # Expected stems per model
     MODEL_STEMS = {
@@ -83,18 +220,62 @@ class SplitterEngine:
         "htdemucs_6s": ["drums", "bass", "vocals", "guitar", "piano", "other"]
     }
     
-    def __init__(self, model_name: str = "htdemucs_6s", mock_mode: bool = False):
+    # Fraction of each model segment shared with its neighbour
+    SEGMENT_OVERLAP = 0.25
+    # Segments per forward pass on CUDA, and the share of free device memory
+    # the batch may use. The API loads two engines and a captured graph keeps
+    # its memory for the engine's lifetime, so the share is kept small.
+    MAX_SEGMENT_BATCH = 8
+    SEGMENT_BATCH_MEMORY_FRACTION = 0.25
+    
+    # Long inputs are separated in chunks to cap peak RAM/VRAM
+    CHUNK_SECONDS = 60.0
+    CHUNK_OVERLAP_SECONDS = 2.0
+    # Input is decoded from disk in blocks of this length
+    STREAM_BLOCK_SECONDS = 30.0
+    # Frames per read/write when normalizing streamed stems
+    FINALIZE_BLOCK_FRAMES = 1 << 18
+    
+    def __init__(
+        self,
+        model_name: str = "htdemucs_6s",
+        mock_mode: bool = False,
+        fp16: bool = True,
+        compile_model: bool = True,
+        mock_latency_s: float = 0.0
+    ):
         """
         Initialize the splitter engine
         
         Args:
             model_name: Demucs model to use (htdemucs_6s supports 6 stems)
             mock_mode: If True, simulates processing without loading models
+            fp16: Run inference under float16 autocast (CUDA only; CPU stays float32)
+            compile_model: torch.compile the model at load time (CUDA only)
+            mock_latency_s: Simulated per-stem processing delay in mock mode
         """
         self.model_name = model_name
         self.mock_mode = mock_mode
+        self.fp16 = fp16
+        self.compile_model = compile_model
+        self.mock_latency_s = mock_latency_s
         self.model = None
         self.device = None
+        self._use_fp16 = False
+        # Whether this engine counts as a user of the cached model (see _get_model)
+        self._holds_model = False
+        # Per sub-model segment geometry and captured CUDA graphs (see _prepare_inference)
+        self._sub_models = []
+        self._sub_weights = []
+        self._segment_plans = []
+        self._graphs = []
+        self._compiled_models = []
+        # Reusable chunk input/output buffers (see _input_buffer, _output_buffers)
+        self._in_buf_pinned = None
+        self._out_buf_device = None
+        self._out_buf_cpu_pinned = None
+        # Serializes use of the buffers and captured graphs (see split_audio)
+        self._split_lock = threading.Lock()
         
         if not DEMUCS_AVAILABLE:
             logger.warning("⚠️  Demucs not available, forcing mock mode")
@@ -107,13 +288,22 @@ class SplitterEngine:
     
     def _initialize_model(self):
         """Load and configure the demucs model with detailed logging"""
+        import torch
+        
         logger.info(f"🔄 Initializing Demucs model: {self.model_name}")
         logger.info("   This may take a few minutes on first run (downloading ~1GB model)...")
         
+        # Must be in place before the first CUDA allocation
+        os.environ.setdefault(
+            "PYTORCH_CUDA_ALLOC_CONF",
+            "expandable_segments:True,max_split_size_mb:512"
+        )
+        
         try:
             # Log before model download/load
             logger.info("   Step 1/3: Loading model weights...")
-            self.model = get_model(self.model_name)
+            self.model = _get_model(self.model_name)
+            self._holds_model = True
             
             logger.info("   Step 2/3: Setting model to eval mode...")
             self.model.eval()
@@ -133,6 +323,26 @@ class SplitterEngine:
             
             self.model = self.model.to(self.device)
             
+            # FP16 is only a win with tensor cores; on CPU it is slower than FP32
+            self._use_fp16 = self.fp16 and self.device.type == "cuda"
+            if self._use_fp16:
+                logger.info("   ⚡ FP16 autocast enabled")
+            
+            # STUDIO_SYNC_CUDNN_TUNING=0 keeps stock layouts and cuDNN heuristics
+            # (escape hatch for regressions on Volta and older cards)
+            cudnn_tuning = os.environ.get("STUDIO_SYNC_CUDNN_TUNING", "1") != "0"
+            if self.device.type == "cuda" and cudnn_tuning:
+                # Segment shapes are fixed, so cuDNN's autotuned algorithm is reused
+                torch.backends.cudnn.benchmark = True
+                torch.set_float32_matmul_precision("high")
+                try:
+                    # Only the 4-D weights of the spectrogram branch are affected
+                    self.model = self.model.to(memory_format=torch.channels_last)
+                except Exception as e:
+                    logger.warning(f"   channels_last not applied: {e}")
+            
+            self._prepare_inference()
+            
             logger.info(f"✅ Model loaded successfully!")
             logger.info(f"   Available stems: {self.model.sources}")
             
@@ -141,6 +351,353 @@ class SplitterEngine:
             logger.error("   Falling back to mock mode")
             self.mock_mode = True
             self.model = None
+            if self._holds_model:
+                _release_model(self.model_name)
+                self._holds_model = False
+    
+    def _prepare_inference(self):
+        """
+        Precompute segment geometry and, on CUDA, capture one graph per sub-model
+        
+        Demucs runs on fixed-size segments, so every full segment has the same
+        input shape and its forward pass can be replayed from a CUDA graph
+        instead of re-launching hundreds of kernels. With compile_model set, the
+        graph is captured over the compiled forward.
+        """
+        import torch
+        
+        # demucs.apply.BagOfModels exposes its members and per-source weights
+        if hasattr(self.model, "models"):
+            self._sub_models = list(self.model.models)
+            self._sub_weights = [list(w) for w in self.model.weights]
+        else:
+            self._sub_models = [self.model]
+            self._sub_weights = [[1.0] * len(self.model.sources)]
+        
+        self._segment_plans = []
+        for sub_model in self._sub_models:
+            segment = int(sub_model.samplerate * sub_model.segment)
+            # Triangular overlap-add window, as in demucs.apply.apply_model
+            window = torch.cat([
+                torch.arange(1, segment // 2 + 1, device=self.device),
+                torch.arange(segment - segment // 2, 0, -1, device=self.device)
+            ]).float()
+            self._segment_plans.append({
+                "segment": segment,
+                "stride": int((1 - self.SEGMENT_OVERLAP) * segment),
+                "valid_length": sub_model.valid_length(segment),
+                "window": window / window.max()
+            })
+        
+        if self._use_fp16:
+            # Probe once so an op without half support falls back to FP32 here
+            # rather than failing every split
+            try:
+                with torch.no_grad(), self._autocast():
+                    for sub_model, plan in zip(self._sub_models, self._segment_plans):
+                        sub_model(torch.zeros(
+                            1, sub_model.audio_channels, plan["valid_length"], device=self.device
+                        ))
+            except Exception as e:
+                logger.warning(f"   FP16 autocast not supported by this model, using FP32: {e}")
+                self._use_fp16 = False
+        
+        # Sized after the FP16 decision, which roughly halves activation memory
+        for sub_model, plan in zip(self._sub_models, self._segment_plans):
+            plan["batch_size"] = self._segment_batch_size(sub_model, plan["valid_length"])
+        
+        self._compiled_models = [None] * len(self._sub_models)
+        self._graphs = [None] * len(self._sub_models)
+        if self.device.type == "cuda":
+            if self.compile_model:
+                self._compile_models()
+            for idx in range(len(self._sub_models)):
+                self._graphs[idx] = self._capture_graph(idx)
+    
+    def _compile_models(self):
+        """
+        torch.compile every sub-model and pay the compile cost with a warm-up pass
+        
+        Compiled in default mode: the engine captures its own CUDA graph over the
+        result (see _capture_graph), which, unlike reduce-overhead's thread-local
+        graphs, is shared by every request thread. Only the plan's batch size is
+        warmed up, as _apply_sub_model pads every minibatch to it; one static shape
+        per sub-model keeps both loaded models well under dynamo's recompile limit.
+        The eager sub-models are kept for _forward to fall back on.
+        """
+        import torch
+        
+        if not hasattr(torch, "compile"):
+            return
+        
+        logger.info("   Compiling model (one-time cost)...")
+        compiled = []
+        try:
+            for sub_model, plan in zip(self._sub_models, self._segment_plans):
+                compiled_model = torch.compile(sub_model, dynamic=False)
+                dummy = torch.zeros(
+                    plan["batch_size"], sub_model.audio_channels, plan["valid_length"],
+                    device=self.device
+                )
+                with torch.no_grad(), self._autocast():
+                    compiled_model(dummy)
+                compiled.append(compiled_model)
+        except Exception as e:
+            # htdemucs has some dynamic shapes that older torch versions can't trace
+            logger.warning(f"   torch.compile failed, running eagerly: {e}")
+            return
+        
+        self._compiled_models = compiled
+        logger.info("   ✅ Model compiled")
+    
+    def _autocast(self):
+        """
+        Autocast context for model forwards (a no-op unless FP16 is enabled)
+        
+        Convolutions and matmuls run in float16 while weights stay float32. The
+        autocast weight cache is disabled so the context can wrap CUDA graph capture.
+        """
+        import torch
+        
+        return torch.autocast(
+            device_type=self.device.type,
+            dtype=torch.float16,
+            enabled=self._use_fp16,
+            cache_enabled=False
+        )
+    
+    def _segment_batch_size(self, sub_model, valid_length: int) -> int:
+        """
+        Number of segments to run per forward pass
+        
+        On CUDA, measures the peak memory of a single-segment forward and fits
+        as many segments as SEGMENT_BATCH_MEMORY_FRACTION of free device memory
+        allows. The CUDA graph captured at this batch size holds its memory pool
+        until release(), so the budget is pinned for the engine's lifetime. On
+        CPU inference is memory-bound and batching gains little, so segments
+        run one at a time.
+        
+        Args:
+            sub_model: Model the batch is sized for
+            valid_length: Padded segment length in samples
+        """
+        import torch
+        
+        if self.device.type != "cuda":
+            return 1
+        
+        dummy = torch.zeros(1, sub_model.audio_channels, valid_length, device=self.device)
+        baseline = torch.cuda.memory_allocated(self.device)
+        torch.cuda.reset_peak_memory_stats(self.device)
+        with torch.no_grad(), self._autocast():
+            sub_model(dummy)
+        per_segment = max(torch.cuda.max_memory_allocated(self.device) - baseline, 1)
+        
+        free_bytes, _ = torch.cuda.mem_get_info(self.device)
+        budget = free_bytes * self.SEGMENT_BATCH_MEMORY_FRACTION
+        return max(1, min(self.MAX_SEGMENT_BATCH, int(budget // per_segment)))
+    
+    def _capture_graph(self, idx: int) -> Optional[Tuple]:
+        """
+        Capture the fixed-shape segment forward of a sub-model as a CUDA graph
+        
+        Captures the compiled sub-model when there is one, the eager one otherwise.
+        
+        Args:
+            idx: Index into self._sub_models
+            
+        Returns:
+            (graph, static_input, static_output), or None to run eagerly
+        """
+        import torch
+        
+        sub_model = self._sub_models[idx]
+        plan = self._segment_plans[idx]
+        module = self._compiled_models[idx]
+        if module is None:
+            module = sub_model
+        
+        try:
+            static_in = torch.zeros(
+                plan["batch_size"], sub_model.audio_channels, plan["valid_length"],
+                device=self.device
+            )
+            with torch.no_grad(), self._autocast():
+                # Warm up on a side stream so autotuning happens outside the capture
+                stream = torch.cuda.Stream()
+                stream.wait_stream(torch.cuda.current_stream())
+                with torch.cuda.stream(stream):
+                    for _ in range(3):
+                        module(static_in)
+                torch.cuda.current_stream().wait_stream(stream)
+                
+                graph = torch.cuda.CUDAGraph()
+                with torch.cuda.graph(graph):
+                    static_out = module(static_in)
+            
+            logger.info(
+                f"   ✅ CUDA graph captured for {plan['batch_size']} segment(s) "
+                f"of {plan['valid_length']} samples"
+            )
+            return graph, static_in, static_out
+        except Exception as e:
+            logger.warning(f"   CUDA graph capture failed, using eager inference: {e}")
+            return None
+    
+    def _forward(self, idx: int, batch: "torch.Tensor") -> "torch.Tensor":
+        """
+        Run one sub-model on a (batch, channels, samples) segment batch
+        
+        Replays the captured CUDA graph; callers pad every minibatch to the plan's
+        batch size, so the shape always matches. Without a graph, uses the compiled
+        sub-model when there is one, falling back to eager for good if it fails
+        for any reason other than running out of memory.
+        """
+        import torch
+        
+        captured = self._graphs[idx]
+        if captured is not None and captured[1].shape == batch.shape:
+            graph, static_in, static_out = captured
+            static_in.copy_(batch)
+            graph.replay()
+            # Callers consume the output before the next replay, so no clone
+            return static_out.float()
+        
+        compiled = self._compiled_models[idx]
+        if compiled is not None:
+            try:
+                with self._autocast():
+                    return compiled(batch).float()
+            except torch.cuda.OutOfMemoryError:
+                # Not a compile problem; split_audio reports it
+                raise
+            except Exception as e:
+                logger.warning(f"   Compiled model failed, running eagerly: {e}")
+                self._compiled_models[idx] = None
+        
+        with self._autocast():
+            return self._sub_models[idx](batch).float()
+    
+    def _apply_segments(self, mix: "torch.Tensor") -> "torch.Tensor":
+        """
+        Separate a (channels, samples) tensor by overlap-adding fixed-size segments
+        
+        Mirrors demucs.apply.apply_model (split=True, no shifts), including the
+        weighting of sub-models in a bag, but routes each segment through _forward.
+        
+        Args:
+            mix: Stereo audio tensor on self.device
+            
+        Returns:
+            (stems, channels, samples) tensor in model.sources order
+        """
+        import torch
+        
+        weights = torch.tensor(self._sub_weights, device=self.device).view(
+            len(self._sub_models), -1, 1, 1
+        )
+        out, _ = self._output_buffers(mix.shape[-1])
+        out.zero_()
+        for idx in range(len(self._sub_models)):
+            self._apply_sub_model(idx, mix, out, weights[idx])
+        out /= weights.sum(dim=0)
+        return out
+    
+    def _apply_sub_model(
+        self, idx: int, mix: "torch.Tensor", out: "torch.Tensor", weight: "torch.Tensor"
+    ):
+        """Overlap-add a single sub-model over mix, adding weight * estimate into out"""
+        import torch
+        import torch.nn.functional as F
+        
+        plan = self._segment_plans[idx]
+        segment, stride = plan["segment"], plan["stride"]
+        valid_length, window = plan["valid_length"], plan["window"]
+        
+        length = mix.shape[-1]
+        offsets = range(0, length, stride)
+        
+        # Overlap-add normalization is known up front, so each segment can be
+        # folded straight into the shared output buffer
+        sum_weight = torch.zeros(length, device=self.device)
+        for offset in offsets:
+            seg_len = min(segment, length - offset)
+            sum_weight[offset:offset + seg_len] += window[:seg_len]
+        
+        # Run segments through the model in minibatches to keep the GPU saturated
+        batch_size = plan["batch_size"]
+        for first in range(0, len(offsets), batch_size):
+            group = []
+            for offset in offsets[first:first + batch_size]:
+                seg_len = min(segment, length - offset)
+                # Pad to valid_length around the segment, using real neighbouring audio
+                # where available (demucs TensorChunk.padded semantics)
+                delta = valid_length - seg_len
+                start = offset - delta // 2
+                lo, hi = max(start, 0), min(start + valid_length, length)
+                padded = F.pad(mix[:, lo:hi], (lo - start, start + valid_length - hi))
+                group.append((offset, seg_len, delta, padded))
+            
+            batch = torch.stack([item[3] for item in group])
+            if len(group) < batch_size:
+                # Zero-pad the trailing partial minibatch to the captured graph's shape
+                batch = F.pad(batch, (0, 0, 0, 0, 0, batch_size - len(group)))
+            batch_out = self._forward(idx, batch)[:len(group)]
+            
+            for (offset, seg_len, delta, _), seg_out in zip(group, batch_out):
+                seg_out = seg_out[..., delta // 2:delta // 2 + seg_len]
+                seg_weight = window[:seg_len] / sum_weight[offset:offset + seg_len]
+                out[..., offset:offset + seg_len] += seg_weight * seg_out * weight
+    
+    def _input_buffer(self, length: int) -> "torch.Tensor":
+        """
+        View into the reusable pinned host buffer used to upload input chunks
+        
+        Safe to reuse per chunk: each chunk's results are synchronized back to
+        the host before the next chunk is staged.
+        
+        Args:
+            length: Number of samples needed
+            
+        Returns:
+            (channels, length) pinned CPU view
+        """
+        import torch
+        
+        if self._in_buf_pinned is None or self._in_buf_pinned.shape[-1] < length:
+            self._in_buf_pinned = None
+            self._in_buf_pinned = torch.empty(
+                self.model.audio_channels, length, pin_memory=True
+            )
+        return self._in_buf_pinned[:, :length]
+    
+    def _output_buffers(self, length: int) -> Tuple["torch.Tensor", "torch.Tensor"]:
+        """
+        Views into the reusable chunk output buffers, grown on demand
+        
+        Chunk length is bounded by CHUNK_SECONDS, so after the first full chunk
+        no further device or pinned host allocations are made.
+        
+        Args:
+            length: Number of samples needed
+            
+        Returns:
+            (stems, channels, length) device view and (stems, length, channels)
+            host view (pinned on CUDA)
+        """
+        import torch
+        
+        if self._out_buf_device is None or self._out_buf_device.shape[-1] < length:
+            num_stems = len(self.model.sources)
+            channels = self.model.audio_channels
+            self._out_buf_device = None
+            self._out_buf_cpu_pinned = None
+            self._out_buf_device = torch.empty(num_stems, channels, length, device=self.device)
+            self._out_buf_cpu_pinned = torch.empty(
+                num_stems, length, channels, pin_memory=self.device.type == "cuda"
+            )
+        
+        return self._out_buf_device[..., :length], self._out_buf_cpu_pinned[:, :length]
     
     def _enforce_stereo(self, waveform: np.ndarray) -> np.ndarray:
         """
@@ -152,32 +709,74 @@ class SplitterEngine:
         Returns:
             Stereo (2, samples) numpy array
         """
-        if waveform.ndim == 1:  # Mono to stereo
-            waveform = np.stack([waveform, waveform])
-        elif waveform.shape[0] == 1:  # Single channel to stereo
-            waveform = np.repeat(waveform, 2, axis=0)
+        if waveform.ndim == 1 or waveform.shape[0] == 1:  # Mono to stereo
+            waveform = np.broadcast_to(waveform, (2, waveform.shape[-1])).copy()
         elif waveform.shape[0] > 2:  # Multi-channel to stereo (take first 2)
             waveform = waveform[:2, :]
         
         return waveform
     
-    def _normalize_stem(self, audio: np.ndarray, ceiling_db: float = -1.0) -> np.ndarray:
+    @staticmethod
+    def _peak(audio: np.ndarray) -> float:
+        """Absolute peak without allocating an np.abs() temporary"""
+        hi = float(audio.max())
+        lo = float(audio.min())
+        return hi if hi > -lo else -lo
+    
+    def _normalize_stem(
+        self, audio: np.ndarray, ceiling_db: float = -1.0, peak: Optional[float] = None
+    ) -> np.ndarray:
         """
-        Peak normalize audio to prevent clipping
+        Peak normalize audio to prevent clipping (in place)
         
         Args:
-            audio: Input audio array
+            audio: Input audio array, scaled in place
             ceiling_db: Target peak level in dBFS (default: -1.0 dBFS)
+            peak: Known peak of the whole stem when audio is only a block of it
             
         Returns:
             Normalized audio array
         """
-        peak = np.abs(audio).max()
+        if peak is None:
+            peak = self._peak(audio)
         if peak > 0:
             target_peak = 10 ** (ceiling_db / 20.0)
-            audio = audio * (target_peak / peak)
+            np.multiply(audio, target_peak / peak, out=audio)
         return audio
     
+    def _accumulate_stats(self, stats: Dict, audio: np.ndarray):
+        """
+        Fold a block of stem audio into running peak / sum-of-squares stats
+        
+        Args:
+            stats: Running stats dict ({"peak", "sum_sq", "size"}), updated in place
+            audio: Audio block, either (channels, samples) or (samples, channels)
+        """
+        flat = audio.ravel()
+        stats["peak"] = max(stats["peak"], self._peak(audio))
+        stats["sum_sq"] += float(np.vdot(flat, flat))
+        stats["size"] += flat.size
+    
+    @staticmethod
+    def _metrics_from_stats(stats: Dict, duration: float, scale: float = 1.0) -> Dict:
+        """
+        Convert peak / sum-of-squares stats into UI meter levels
+        
+        Args:
+            stats: Stats dict ({"peak", "sum_sq", "size"})
+            duration: Duration in seconds
+            scale: Gain applied to the audio after the stats were taken
+            
+        Returns:
+            Dictionary with rms_db, peak_db, duration
+        """
+        rms = math.sqrt(stats["sum_sq"] / max(stats["size"], 1)) * scale
+        return {
+            "rms_db": float(20 * np.log10(rms + 1e-10)),
+            "peak_db": float(20 * np.log10(stats["peak"] * scale + 1e-10)),
+            "duration": float(duration)
+        }
+    
     def _calculate_metrics(self, audio: np.ndarray, sr: int) -> Dict:
         """
         Calculate RMS and peak levels for UI meters
@@ -189,19 +788,233 @@ class SplitterEngine:
         Returns:
             Dictionary with rms_db, peak_db, duration
         """
-        rms = np.sqrt(np.mean(audio ** 2))
-        rms_db = 20 * np.log10(rms + 1e-10)
+        stats = {"peak": 0.0, "sum_sq": 0.0, "size": 0}
+        self._accumulate_stats(stats, audio)
+        duration = audio.shape[1] / sr if audio.ndim > 1 else len(audio) / sr
+        return self._metrics_from_stats(stats, duration)
+    
+    def _open_stream(self, audio_path: str, sr: int) -> Tuple[Iterator[np.ndarray], int]:
+        """
+        Stream an audio file as stereo float32 blocks at the model sample rate
         
-        peak = np.abs(audio).max()
-        peak_db = 20 * np.log10(peak + 1e-10)
+        Files libsndfile can read are decoded block by block (resampled with a
+        streaming soxr resampler when needed), so the whole track is never held
+        in memory. Anything else is decoded in full via _fast_load and sliced.
         
-        duration = audio.shape[1] / sr if audio.ndim > 1 else len(audio) / sr
+        Args:
+            audio_path: Path to audio file
+            sr: Output sample rate
+            
+        Returns:
+            Tuple of (iterator over (2, n) blocks, expected total samples)
+        """
+        try:
+            info = sf.info(audio_path)
+        except sf.LibsndfileError:
+            info = None
         
-        return {
-            "rms_db": float(rms_db),
-            "peak_db": float(peak_db),
-            "duration": float(duration)
-        }
+        soxr = None
+        if info is not None and info.samplerate != sr:
+            try:
+                import soxr
+            except ImportError:
+                info = None
+        
+        if info is None:
+            waveform, _ = _fast_load(audio_path, sr_target=sr)
+            waveform = np.ascontiguousarray(self._enforce_stereo(waveform), dtype=np.float32)
+            step = int(self.STREAM_BLOCK_SECONDS * sr)
+            blocks = (waveform[:, i:i + step] for i in range(0, waveform.shape[-1], step))
+            return blocks, waveform.shape[-1]
+        
+        expected = int(round(info.frames * sr / info.samplerate))
+        return self._read_blocks(audio_path, info, sr, soxr), expected
+    
+    def _read_blocks(self, audio_path: str, info, sr: int, soxr) -> Iterator[np.ndarray]:
+        """Generator behind _open_stream for files libsndfile can read"""
+        resampler = None
+        if soxr is not None:
+            resampler = soxr.ResampleStream(
+                info.samplerate, sr, info.channels, dtype="float32", quality="HQ"
+            )
+        
+        def to_stereo(block: np.ndarray) -> np.ndarray:
+            # soundfile yields (samples, channels)
+            return np.ascontiguousarray(self._enforce_stereo(block.T), dtype=np.float32)
+        
+        blocksize = int(self.STREAM_BLOCK_SECONDS * info.samplerate)
+        with sf.SoundFile(audio_path) as f:
+            for block in f.blocks(blocksize=blocksize, dtype="float32", always_2d=True):
+                if resampler is not None:
+                    block = resampler.resample_chunk(block)
+                if block.shape[0]:
+                    yield to_stereo(block)
+        
+        if resampler is not None:
+            block = resampler.resample_chunk(
+                np.zeros((0, info.channels), dtype=np.float32), last=True
+            )
+            if block.shape[0]:
+                yield to_stereo(block)
+    
+    @staticmethod
+    def _assemble_chunks(
+        blocks: Iterator[np.ndarray], chunk_len: int, overlap: int
+    ) -> Iterator[Tuple[np.ndarray, bool]]:
+        """
+        Regroup a block stream into chunk_len chunks that overlap by overlap samples
+        
+        Yields (chunk, is_last). A chunk is only emitted once more audio is known
+        to follow it, so the last one can be flagged without knowing the length.
+        """
+        buf = np.empty((2, 0), dtype=np.float32)
+        for block in blocks:
+            buf = np.concatenate([buf, block], axis=1)
+            while buf.shape[1] > chunk_len:
+                yield buf[:, :chunk_len], False
+                buf = buf[:, chunk_len - overlap:]
+        if buf.shape[1]:
+            yield buf, True
+    
+    def _split_chunked(
+        self,
+        blocks: Iterator[np.ndarray],
+        expected_samples: int,
+        sr: int,
+        part_paths: List[Path],
+        report_progress: Callable[[int, str], None],
+        executor: ThreadPoolExecutor,
+        chunk_s: float = CHUNK_SECONDS,
+        overlap_s: float = CHUNK_OVERLAP_SECONDS
+    ) -> List[Dict]:
+        """
+        Run the model over fixed-size chunks and stream each stem to disk
+        
+        Consecutive chunks overlap by overlap_s seconds and are crossfaded with
+        a Hann window, so peak memory depends on chunk_s rather than track length.
+        
+        Args:
+            blocks: Stereo (2, n) float32 input blocks (see _open_stream)
+            expected_samples: Approximate input length, for progress reporting
+            sr: Sample rate
+            part_paths: Per-stem paths for the unnormalized float output
+            report_progress: Function to call with (progress: int, stage: str)
+            executor: Pool that writes stem blocks to disk off the inference thread
+            chunk_s: Chunk length in seconds
+            overlap_s: Crossfade length in seconds
+            
+        Returns:
+            Per-stem running stats ({"peak", "sum_sq", "size"}), in model.sources order
+        """
+        import torch
+        
+        chunk_len = int(chunk_s * sr)
+        overlap = int(overlap_s * sr)
+        step = chunk_len - overlap
+        num_chunks = 1
+        if expected_samples > chunk_len:
+            num_chunks += math.ceil((expected_samples - chunk_len) / step)
+        
+        # Periodic Hann halves sum to 1 across the overlap
+        fade = torch.hann_window(2 * overlap, device=self.device)
+        fade_in, fade_out = fade[:overlap], fade[overlap:]
+        
+        stats = [{"peak": 0.0, "sum_sq": 0.0, "size": 0} for _ in part_paths]
+        writers = [
+            sf.SoundFile(str(path), "w", samplerate=sr, channels=2, format="WAV", subtype="FLOAT")
+            for path in part_paths
+        ]
+        
+        pending = []
+        try:
+            tail = None
+            idx = -1
+            for idx, (chunk_np, last) in enumerate(self._assemble_chunks(blocks, chunk_len, overlap)):
+                # The chunk count is an estimate when the input is resampled on the fly
+                num_chunks = max(num_chunks, idx + 1)
+                report_progress(
+                    int(30 + 40 * idx / num_chunks),
+                    f"Separating stems (chunk {idx + 1}/{num_chunks})..."
+                )
+                
+                chunk = torch.from_numpy(chunk_np)
+                if self.device.type == "cuda":
+                    # Stage through pinned memory so the upload is a true async DMA
+                    chunk = self._input_buffer(chunk.shape[-1]).copy_(chunk)
+                chunk = chunk.to(self.device, non_blocking=True)
+                
+                with torch.no_grad():
+                    sources = self._apply_segments(chunk)
+                
+                # Crossfade with the held-back tail of the previous chunk
+                if tail is not None:
+                    sources[..., :overlap] = tail * fade_out + sources[..., :overlap] * fade_in
+                
+                if not last:
+                    keep = sources.shape[-1] - overlap
+                    tail = sources[..., keep:].clone()
+                    sources = sources[..., :keep]
+                
+                # Interleave to (stems, samples, channels) while copying into the
+                # reusable host buffer, so each stem is written without a transpose
+                _, host_buf = self._output_buffers(sources.shape[-1])
+                # The previous chunk's writes read from the same buffer
+                for future in pending:
+                    future.result()
+                host_buf.copy_(sources.permute(0, 2, 1), non_blocking=True)
+                if self.device.type == "cuda":
+                    torch.cuda.current_stream().synchronize()
+                block = host_buf.numpy()
+                
+                # Encode stems in the background while the next chunk is inferred
+                pending = [
+                    executor.submit(self._write_block, writer, stem_stats, stem_audio)
+                    for writer, stem_stats, stem_audio in zip(writers, stats, block)
+                ]
+            
+            for future in pending:
+                future.result()
+            if idx < 0:
+                raise ValueError("Audio file contains no samples")
+        finally:
+            wait(pending)
+            for writer in writers:
+                writer.close()
+        
+        return stats
+    
+    def _write_block(self, writer: sf.SoundFile, stats: Dict, audio: np.ndarray):
+        """Append one chunk of a stem to its part file and fold it into the stem's stats"""
+        writer.write(audio)
+        self._accumulate_stats(stats, audio)
+    
+    def _finalize_part(
+        self, part_path: Path, stem_path: Path, stats: Dict, sr: int, ceiling_db: float = -1.0
+    ) -> Dict:
+        """
+        Peak normalize a streamed stem into its final 16-bit WAV, block by block
+        
+        Args:
+            part_path: Unnormalized float output from _split_chunked
+            stem_path: Destination stem file
+            stats: Running stats accumulated for this stem
+            sr: Sample rate
+            ceiling_db: Target peak level in dBFS (default: -1.0 dBFS)
+            
+        Returns:
+            Dictionary with rms_db, peak_db, duration of the normalized stem
+        """
+        peak = stats["peak"]
+        scale = 10 ** (ceiling_db / 20.0) / peak if peak > 0 else 1.0
+        
+        with sf.SoundFile(str(part_path)) as src, \
+                sf.SoundFile(str(stem_path), "w", samplerate=sr, channels=src.channels, subtype="PCM_16") as dst:
+            frames = src.frames
+            for block in src.blocks(blocksize=self.FINALIZE_BLOCK_FRAMES, dtype="float32"):
+                dst.write(self._normalize_stem(block, ceiling_db, peak=peak))
+        part_path.unlink()
+        
+        return self._metrics_from_stats(stats, frames / sr, scale)
     
     def check_cache(self, audio_path: str, output_base_dir: str, mode: str) -> Tuple[bool, Optional[Dict]]:
         """
@@ -245,8 +1058,7 @@ class SplitterEngine:
                 
                 # Load audio to get metrics
                 try:
-                    with suppress_c_stderr():
-                        audio_data, sr = librosa.load(str(stem_path), sr=None, mono=False)
+                    audio_data, sr = _fast_load(str(stem_path))
                     
                     if audio_data.ndim == 1:
                         audio_data = np.stack([audio_data, audio_data])
@@ -351,36 +1163,22 @@ class SplitterEngine:
                 return self._mock_split(audio_path, progress_callback)
             
             # ================================================================
-            # Stage 1: Load Audio (5% -> 15%)
+            # Stage 1: Open Audio (5% -> 15%)
             # ================================================================
-            logger.info("   Stage 1/4: Loading audio file...")
+            logger.info("   Stage 1/4: Opening audio stream...")
             report_progress(10, "Analyzing audio waveform...")
             
-            with suppress_c_stderr():
-                waveform, sr = librosa.load(str(audio_path), sr=44100, mono=False)
-            
-            # Calculate duration for logging
-            duration = waveform.shape[1] / sr if waveform.ndim > 1 else len(waveform) / sr
-            logger.info(f"   Audio loaded: {duration:.1f}s @ {sr}Hz")
-            
-            # CRITICAL: Enforce stereo for demucs
-            waveform = self._enforce_stereo(waveform)
-            logger.info(f"   Shape after stereo enforcement: {waveform.shape}")
+            # Decoded block by block as stereo float32 (CRITICAL for demucs)
+            sr = 44100
+            blocks, expected_samples = self._open_stream(str(audio_path), sr)
+            logger.info(f"   Audio opened: {expected_samples / sr:.1f}s @ {sr}Hz")
             
             report_progress(15, "Preparing for AI processing...")
             
             # ================================================================
-            # Stage 2: Prepare Tensor (15% -> 25%)
+            # Stage 2: Prepare Output (15% -> 25%)
             # ================================================================
-            logger.info("   Stage 2/4: Preparing tensor for model...")
-            
-            # Convert to torch tensor
-            waveform_tensor = torch.from_numpy(waveform).float().to(self.device)
-            waveform_tensor = waveform_tensor.unsqueeze(0)  # Add batch dimension
-            
-            logger.info(f"   Tensor shape: {waveform_tensor.shape}, Device: {self.device}")
-            
-            report_progress(20, "Converting to tensor format...")
+            logger.info("   Stage 2/4: Preparing output files...")
             
             # Determine output directory - use cache path if output_base_dir provided
             if output_dir is None and output_base_dir:
@@ -393,86 +1191,86 @@ class SplitterEngine:
             
             output_dir.mkdir(parents=True, exist_ok=True)
             
-            report_progress(25, "Starting neural network inference...")
-            
-            # ================================================================
-            # Stage 3: Model Inference (25% -> 70%)
-            # This is the heavy computation
-            # ================================================================
-            logger.info("   Stage 3/4: Running Demucs model (this takes a while)...")
-            logger.info(f"   Processing {len(self.model.sources)} stems: {self.model.sources}")
-            
             stem_names = list(self.model.sources)
             num_stems = len(stem_names)
             
-            # Create a progress callback that reports stem-by-stem progress
-            inference_start_pct = 25
-            inference_end_pct = 70
-            inference_range = inference_end_pct - inference_start_pct
+            # Professional naming: OriginalName_StemName_ModelName.wav
+            stem_paths = [
+                output_dir / f"{audio_path.stem}_{stem_name}_{self.model_name}.wav"
+                for stem_name in stem_names
+            ]
+            # Unnormalized float output, streamed chunk by chunk during inference
+            part_paths = [path.with_name(path.name + ".part") for path in stem_paths]
+            
+            report_progress(25, "Starting neural network inference...")
             
-            report_progress(30, f"Separating stems (0/{num_stems})...")
+            # libsndfile and NumPy release the GIL, so per-stem disk work runs in parallel
+            executor = ThreadPoolExecutor(max_workers=num_stems)
             
             try:
-                with torch.no_grad():
-                    # The apply_model function handles chunking internally
-                    sources = apply_model(
-                        self.model, 
-                        waveform_tensor, 
-                        device=self.device, 
-                        progress=True,  # Enable internal progress logging
-                        num_workers=0   # Disable multiprocessing workers on macOS
-                    )[0]
+                # ============================================================
+                # Stage 3: Model Inference (25% -> 70%)
+                # This is the heavy computation
+                # ============================================================
+                logger.info("   Stage 3/4: Running Demucs model (this takes a while)...")
+                logger.info(f"   Processing {num_stems} stems: {stem_names}")
                 
-                logger.info("   Model inference complete!")
+                try:
+                    # Buffers and captured graphs are shared per engine, so
+                    # concurrent requests on one engine run inference in turn
+                    with self._split_lock:
+                        stem_stats = self._split_chunked(
+                            blocks, expected_samples, sr, part_paths, report_progress, executor
+                        )
+                    logger.info("   Model inference complete!")
+                    
+                except RuntimeError as e:
+                    if "out of memory" in str(e).lower():
+                        logger.error(f"   Memory error: {e}")
+                        raise MemoryError(f"Out of memory processing audio. Try a shorter file. Original error: {e}")
+                    raise
                 
-            except RuntimeError as e:
-                if "out of memory" in str(e).lower():
-                    logger.error(f"   Memory error: {e}")
-                    raise MemoryError(f"Out of memory processing audio. Try a shorter file. Original error: {e}")
-                raise
-            
-            report_progress(70, "Model inference complete...")
-            
-            # ================================================================
-            # Stage 4: Save Stems (70% -> 100%)
-            # ================================================================
-            logger.info("   Stage 4/4: Saving separated stems...")
-            
-            # Extract and save stems with professional naming
-            stems = {}
-            
-            progress_per_stem = 25 / num_stems
-            
-            for idx, (stem_name, source) in enumerate(zip(stem_names, sources)):
-                stem_pct = int(70 + (idx + 1) * progress_per_stem)
-                report_progress(stem_pct, f"Saving {stem_name.capitalize()} stem...")
-                logger.info(f"   Saving stem: {stem_name}")
+                report_progress(70, "Model inference complete...")
                 
-                # Convert to numpy and normalize
-                stem_audio = source.cpu().numpy()
-                stem_audio = self._normalize_stem(stem_audio, ceiling_db=-1.0)
+                # ============================================================
+                # Stage 4: Save Stems (70% -> 100%)
+                # ============================================================
+                logger.info("   Stage 4/4: Saving separated stems...")
                 
-                # Professional naming: OriginalName_StemName_ModelName.wav
-                stem_filename = f"{audio_path.stem}_{stem_name}_{self.model_name}.wav"
-                stem_path = output_dir / stem_filename
+                progress_per_stem = 25 / num_stems
                 
-                # Save stem (transpose for soundfile: samples x channels)
-                sf.write(str(stem_path), stem_audio.T, sr)
+                futures = {
+                    executor.submit(
+                        self._finalize_part,
+                        part_paths[idx], stem_paths[idx], stem_stats[idx], sr, -1.0
+                    ): idx
+                    for idx in range(num_stems)
+                }
                 
-                # Calculate metrics for UI
-                metrics = self._calculate_metrics(stem_audio, sr)
+                stem_metrics = {}
+                for done, future in enumerate(as_completed(futures), start=1):
+                    idx = futures[future]
+                    stem_metrics[idx] = future.result()
+                    stem_pct = int(70 + done * progress_per_stem)
+                    report_progress(stem_pct, f"Saved {stem_names[idx].capitalize()} stem...")
+                    logger.info(f"   Saved stem: {stem_names[idx]}")
                 
-                stems[stem_name] = {
-                    "path": str(stem_path),
-                    "rms_db": metrics["rms_db"],
-                    "peak_db": metrics["peak_db"],
-                    "duration": metrics["duration"]
-                }
+                # Keep model.sources order regardless of completion order
+                stems = {}
+                for idx, stem_name in enumerate(stem_names):
+                    metrics = stem_metrics[idx]
+                    stems[stem_name] = {
+                        "path": str(stem_paths[idx]),
+                        "rms_db": metrics["rms_db"],
+                        "peak_db": metrics["peak_db"],
+                        "duration": metrics["duration"]
+                    }
+            finally:
+                executor.shutdown(wait=True)
+                for part_path in part_paths:
+                    part_path.unlink(missing_ok=True)
             
-            # Clear memory
-            del sources, waveform_tensor, waveform
-            if self.device and self.device.type == "cuda":
-                torch.cuda.empty_cache()
+            _maybe_empty_cache(self.device)
             
             # Compute file hash for result
             file_hash = compute_file_hash(str(audio_path))
@@ -499,8 +1297,7 @@ class SplitterEngine:
             logger.error(f"Split failed: {e}", exc_info=True)
             
             # Cleanup on failure
-            if self.device and self.device.type == "cuda":
-                torch.cuda.empty_cache()
+            _maybe_empty_cache(self.device)
             
             return {
                 "success": False,
@@ -508,6 +1305,32 @@ class SplitterEngine:
                 "stems": {}
             }
     
+    def release(self):
+        """
+        Drop the loaded model and free cached GPU memory (e.g. on server shutdown)
+        
+        Waits for an in-flight split on this engine to finish first.
+        """
+        with _ENGINE_CACHE_LOCK:
+            if _ENGINE_CACHE.get(self.model_name) is self:
+                del _ENGINE_CACHE[self.model_name]
+        if self._holds_model:
+            # The weights stay cached while another engine still uses them
+            _release_model(self.model_name)
+            self._holds_model = False
+        
+        with self._split_lock:
+            self.model = None
+            self._sub_models = []
+            self._graphs = []
+            self._compiled_models = []
+            self._in_buf_pinned = None
+            self._out_buf_device = None
+            self._out_buf_cpu_pinned = None
+        if self.device and self.device.type == "cuda":
+            import torch
+            torch.cuda.empty_cache()
+    
     def _mock_split(self, audio_path: Path, progress_callback: Optional[Callable[[int, str], None]]) -> Dict:
         """Mock processing for UI testing without GPU - returns 6 stems"""
         import time
@@ -516,30 +1339,36 @@ class SplitterEngine:
         stem_names = self.MODEL_STEMS.get(self.model_name, ['drums', 'bass', 'vocals', 'guitar', 'piano', 'other'])
         stems = {}
         
+        # Fake metadata - adjust levels based on stem type
+        rms_variation = {
+            'vocals': (-10, 6),
+            'drums': (-12, 6),
+            'bass': (-16, 6),
+            'guitar': (-14, 6),
+            'piano': (-18, 6),
+            'other': (-20, 6)
+        }
+        rms_table = np.array([rms_variation.get(name, (-18, 6)) for name in stem_names], dtype=float)
+        
+        # One draw for every stem's (rms, peak, duration)
+        draws = np.random.rand(len(stem_names), 3)
+        rms_dbs = rms_table[:, 0] + draws[:, 0] * rms_table[:, 1]
+        peak_dbs = -3.0 + draws[:, 1] * 2
+        durations = 180.0 + draws[:, 2] * 60
+        
         for idx, stem_name in enumerate(stem_names):
-            time.sleep(0.3)  # Simulate processing
+            if self.mock_latency_s:
+                time.sleep(self.mock_latency_s)  # Simulate processing
             pct = int(20 + (idx + 1) * (70 / len(stem_names)))
             if progress_callback:
                 progress_callback(pct, f"Separating {stem_name.capitalize()}...")
             logger.info(f"   [MOCK] Processing stem: {stem_name}")
             
-            # Fake metadata - adjust levels based on stem type
-            rms_variation = {
-                'vocals': (-10, 6),
-                'drums': (-12, 6),
-                'bass': (-16, 6),
-                'guitar': (-14, 6),
-                'piano': (-18, 6),
-                'other': (-20, 6)
-            }
-            
-            rms_min, rms_range = rms_variation.get(stem_name, (-18, 6))
-            
             stems[stem_name] = {
                 "path": f"/mock/path/{audio_path.stem}_{stem_name}_{self.model_name}.wav",
-                "rms_db": rms_min + np.random.rand() * rms_range,
-                "peak_db": -3.0 + np.random.rand() * 2,
-                "duration": 180.0 + np.random.rand() * 60
+                "rms_db": float(rms_dbs[idx]),
+                "peak_db": float(peak_dbs[idx]),
+                "duration": float(durations[idx])
             }
         
         if progress_callback:
@@ -558,6 +1387,10 @@ class SplitterEngine:
         }
 
 
+# Engines reused by the legacy split_audio() wrapper, keyed by model name
+_ENGINE_CACHE: Dict[str, SplitterEngine] = {}
+
+
 def split_audio(
     audio_path: str, 
     model_name: str = "htdemucs_6s",
@@ -566,6 +1399,10 @@ def split_audio(
     """
     Legacy function wrapper for backward compatibility
     
+    The engine (and its model weights) is created once per model name and
+    reused by subsequent calls. Long-lived processes should prefer holding a
+    SplitterEngine directly, which also exposes caching and release().
+    
     Args:
         audio_path: Path to audio file
         model_name: Demucs model to use
@@ -574,7 +1411,15 @@ def split_audio(
     Returns:
         Dictionary with paths to separated audio files and metadata
     """
-    engine = SplitterEngine(model_name=model_name)
+    engine = _ENGINE_CACHE.get(model_name)
+    if engine is None:
+        # Built outside the lock so a slow model load doesn't hold up other
+        # callers; if another thread published an engine first, use that one
+        candidate = SplitterEngine(model_name=model_name)
+        with _ENGINE_CACHE_LOCK:
+            engine = _ENGINE_CACHE.setdefault(model_name, candidate)
+        if engine is not candidate:
+            candidate.release()
     return engine.split_audio(audio_path, progress_callback=progress_callback)
 
 
@@ -589,18 +1434,28 @@ def get_stem_info(audio_path: str) -> Dict:
         Dictionary with audio information
     """
     try:
-        with suppress_c_stderr():
-            y, sr = librosa.load(audio_path, sr=None, mono=False)
-        
-        # Ensure proper channel detection
-        channels = 2 if y.ndim > 1 and y.shape[0] == 2 else 1
-        duration = y.shape[1] / sr if y.ndim > 1 else len(y) / sr
+        # Header-only read: no decode, constant cost regardless of file length
+        try:
+            info = sf.info(audio_path)
+            duration = info.frames / info.samplerate
+            sr = info.samplerate
+            channels = info.channels
+        except sf.LibsndfileError:
+            # Formats libsndfile can't parse (e.g. m4a) go through audioread
+            import audioread
+            import librosa
+            
+            with suppress_c_stderr():
+                duration = librosa.get_duration(path=audio_path)
+                with audioread.audio_open(audio_path) as f:
+                    sr = f.samplerate
+                    channels = f.channels
         
         return {
             "file": audio_path,
             "duration": float(duration),
             "sample_rate": int(sr),
-            "channels": channels,
+            "channels": int(channels),
             "can_split": True,
             "format": Path(audio_path).suffix[1:].upper()
         }
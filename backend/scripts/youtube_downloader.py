@@ -1,15 +1,59 @@
 import os
+import re
+import json
 from pathlib import Path
 import yt_dlp
 
 YOUTUBE_DIR = Path(os.getenv("YOUTUBE_DIR", "youtube_downloads"))
 YOUTUBE_DIR.mkdir(exist_ok=True)
 
+# Video id from watch?v= (or &v=), youtu.be/ and /shorts/ URLs
+_YT_ID = re.compile(r"(?:[?&]v=|youtu\.be/|/shorts/)([A-Za-z0-9_-]{11})")
+# yt-dlp leftovers and our metadata sidecars are not audio
+_NON_AUDIO_SUFFIXES = {'.json', '.part', '.ytdl'}
+
+
+def _find_cached(url: str, output_dir: Path):
+    """
+    Return metadata for a previously downloaded video without touching the network.
+    Returns None if the URL has no recognizable id or nothing usable is on disk.
+    """
+    m = _YT_ID.search(url)
+    if not m:
+        return None
+    video_id = m.group(1)
+    meta_path = output_dir / f"{video_id}.json"
+    if not meta_path.exists():
+        return None
+    audio = next(
+        (p for p in output_dir.glob(f"{video_id}.*") if p.suffix not in _NON_AUDIO_SUFFIXES),
+        None
+    )
+    if audio is None:
+        return None
+    try:
+        meta = json.loads(meta_path.read_text())
+    except (OSError, ValueError):
+        return None
+    return {
+        'title': meta.get('title', ''),
+        'duration': meta.get('duration', 0),
+        'thumbnail': meta.get('thumbnail', ''),
+        'file_path': str(audio),
+        'video_id': video_id,
+        'cached': True,
+    }
+
+
 def download_youtube_audio(url: str, output_dir: Path = YOUTUBE_DIR):
     """
     Download audio from a YouTube URL using yt-dlp.
     Returns metadata and file path.
     """
+    cached = _find_cached(url, output_dir)
+    if cached is not None:
+        return cached
+    
     ydl_opts = {
         'format': 'bestaudio/best',
         'outtmpl': str(output_dir / '%(id)s.%(ext)s'),
@@ -28,10 +72,16 @@ def download_youtube_audio(url: str, output_dir: Path = YOUTUBE_DIR):
         if info is None:
             raise Exception("Failed to download video info.")
         file_path = output_dir / f"{info['id']}.wav"
-        return {
+        result = {
             'title': info.get('title', ''),
             'duration': info.get('duration', 0),
+            'thumbnail': info.get('thumbnail', ''),
             'file_path': str(file_path),
             'video_id': info['id'],
             'cached': file_path.exists(),
         }
+        if file_path.exists():
+            # Sidecar lets repeat requests skip extract_info entirely
+            meta = {k: result[k] for k in ('title', 'duration', 'thumbnail')}
+            (output_dir / f"{info['id']}.json").write_text(json.dumps(meta))
+        return result
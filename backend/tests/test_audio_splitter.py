@@ -0,0 +1,242 @@
+"""
+Tests for the splitter engine, driven by a stub model instead of demucs weights
+
+Run from backend/: python -m unittest discover
+"""
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from importlib.util import find_spec
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+from scripts import audio_splitter
+from scripts.audio_splitter import SplitterEngine
+
+TORCH_AVAILABLE = find_spec("torch") is not None
+SR = 44100
+
+
+def _stub_model():
+    """Demucs-shaped model whose stems are the mix scaled by 1..4"""
+    import torch
+
+    class StubModel(torch.nn.Module):
+        samplerate = SR
+        segment = 0.25
+        audio_channels = 2
+        sources = ["drums", "bass", "other", "vocals"]
+
+        def valid_length(self, length):
+            return length
+
+        def forward(self, mix):
+            # Release the GIL so concurrent splits interleave mid-chunk
+            time.sleep(0.001)
+            gains = torch.arange(1, len(self.sources) + 1, dtype=mix.dtype, device=mix.device)
+            return mix.unsqueeze(1) * gains.view(1, -1, 1, 1)
+
+    return StubModel()
+
+
+def _fir_model(kernels):
+    """
+    Demucs-shaped model that runs each stem's FIR kernel over the mix
+
+    Unlike the gain stub this mixes neighbouring samples, so misplaced segment
+    or chunk boundaries show up in the output. valid_length pads each segment
+    with enough real context for the kernels.
+    """
+    import torch
+    import torch.nn.functional as F
+
+    taps = kernels.shape[-1]
+
+    class FirModel(torch.nn.Module):
+        samplerate = SR
+        segment = 0.25
+        audio_channels = 2
+        sources = ["drums", "bass", "other", "vocals"]
+
+        def valid_length(self, length):
+            return length + taps - 1
+
+        def forward(self, mix):
+            batch, channels, length = mix.shape
+            out = F.conv1d(mix.reshape(-1, 1, length), kernels, padding="same")
+            return out.view(batch, channels, -1, length).transpose(1, 2)
+
+    return FirModel()
+
+
+def _stub_engine(model=None):
+    import torch
+
+    engine = SplitterEngine(model_name="htdemucs", mock_mode=True)
+    engine.model = model if model is not None else _stub_model()
+    engine.device = torch.device("cpu")
+    engine.mock_mode = False
+    engine.compile_model = False
+    engine._prepare_inference()
+    return engine
+
+
+@unittest.skipUnless(TORCH_AVAILABLE, "torch not installed")
+class ConcurrentSplitTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _write_input(self, name: str, seed: int) -> Path:
+        audio = np.random.default_rng(seed).uniform(-0.5, 0.5, (3 * SR, 2)).astype(np.float32)
+        path = self.tmp / f"{name}.wav"
+        sf.write(str(path), audio, SR, subtype="FLOAT")
+        return path
+
+    def _max_error(self, input_path: Path, result: dict) -> float:
+        """Every stub stem normalizes to the input normalized to -1 dBFS"""
+        mix, _ = sf.read(str(input_path), dtype="float32")
+        expected = mix * (10 ** (-1.0 / 20.0) / np.abs(mix).max())
+        errors = []
+        for stem in result["stems"].values():
+            audio, _ = sf.read(stem["path"], dtype="float32")
+            errors.append(float(np.abs(audio - expected).max()))
+        return max(errors)
+
+    def test_concurrent_splits_on_one_engine(self):
+        engine = _stub_engine()
+        inputs = [self._write_input(f"input{i}", seed=i) for i in range(2)]
+        results = [None, None]
+
+        def run(i):
+            results[i] = engine.split_audio(
+                str(inputs[i]), output_dir=str(self.tmp / f"out{i}"), check_cache=False
+            )
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for input_path, result in zip(inputs, results):
+            self.assertTrue(result["success"], result.get("error"))
+            self.assertEqual(len(result["stems"]), 4)
+            # PCM_16 quantization is ~3e-5; interleaved buffers give errors near 1.0
+            self.assertLess(self._max_error(input_path, result), 1e-3)
+
+
+@unittest.skipUnless(TORCH_AVAILABLE, "torch not installed")
+class StreamingTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+        self.rng = np.random.default_rng(0)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _split(self, engine, audio, chunk_s, overlap_s, tag):
+        """Run _split_chunked over (2, n) audio; returns the part paths and stats"""
+        part_paths = [self.tmp / f"{tag}_{name}.part" for name in engine.model.sources]
+        blocks = (audio[:, i:i + SR] for i in range(0, audio.shape[1], SR))
+        with ThreadPoolExecutor(max_workers=len(part_paths)) as executor:
+            stats = engine._split_chunked(
+                blocks, audio.shape[1], SR, part_paths, lambda pct, stage: None, executor,
+                chunk_s=chunk_s, overlap_s=overlap_s
+            )
+        return part_paths, stats
+
+    def test_chunked_split_matches_full_signal(self):
+        import torch
+        import torch.nn.functional as F
+
+        kernels = torch.from_numpy(self.rng.standard_normal((4, 1, 9)).astype(np.float32))
+        engine = _stub_engine(_fir_model(kernels))
+        audio = self.rng.uniform(-0.5, 0.5, (2, 3 * SR)).astype(np.float32)
+
+        # 1 s chunks crossfaded over 0.25 s, so the 3 s input spans several chunks
+        part_paths, stats = self._split(engine, audio, chunk_s=1.0, overlap_s=0.25, tag="chunked")
+
+        expected = F.conv1d(torch.from_numpy(audio).unsqueeze(1), kernels, padding="same")
+        for stem, (path, stem_stats) in enumerate(zip(part_paths, stats)):
+            out, _ = sf.read(str(path), dtype="float32")
+            self.assertEqual(out.shape, (audio.shape[1], 2))
+            np.testing.assert_allclose(out.T, expected[:, stem].numpy(), atol=1e-5)
+            self.assertAlmostEqual(stem_stats["peak"], float(np.abs(out).max()), places=6)
+            self.assertEqual(stem_stats["size"], out.size)
+
+    def test_finalize_part_normalizes_streamed_stem(self):
+        engine = _stub_engine()
+        audio = self.rng.uniform(-0.5, 0.5, (2, 2 * SR)).astype(np.float32)
+        part_paths, stats = self._split(engine, audio, chunk_s=1.0, overlap_s=0.25, tag="final")
+
+        part, _ = sf.read(str(part_paths[0]), dtype="float32")
+        stem_path = self.tmp / "stem.wav"
+        engine.FINALIZE_BLOCK_FRAMES = SR // 2
+        metrics = engine._finalize_part(part_paths[0], stem_path, stats[0], SR)
+
+        self.assertFalse(part_paths[0].exists())
+        stem, _ = sf.read(str(stem_path), dtype="float32")
+        ceiling = 10 ** (-1.0 / 20.0)
+        np.testing.assert_allclose(stem, part * (ceiling / np.abs(part).max()), atol=1e-4)
+        self.assertAlmostEqual(metrics["peak_db"], -1.0, places=4)
+        self.assertAlmostEqual(metrics["duration"], 2.0)
+
+    def test_stream_resamples_in_blocks(self):
+        engine = _stub_engine()
+        # Several stream blocks, so the soxr stream carries state across them
+        engine.STREAM_BLOCK_SECONDS = 0.5
+        audio = self.rng.uniform(-0.5, 0.5, (3 * 48000, 2)).astype(np.float32)
+        path = self.tmp / "input48k.wav"
+        sf.write(str(path), audio, 48000, subtype="FLOAT")
+
+        blocks, expected_samples = engine._open_stream(str(path), SR)
+        streamed = np.concatenate(list(blocks), axis=1)
+
+        full = audio_splitter._resample(audio, 48000, SR).T
+        self.assertEqual(expected_samples, 3 * SR)
+        self.assertEqual(streamed.shape, full.shape)
+        np.testing.assert_allclose(streamed, full, atol=1e-4)
+
+    def test_mono_input_streams_as_stereo(self):
+        engine = _stub_engine()
+        engine.STREAM_BLOCK_SECONDS = 0.5
+        audio = self.rng.uniform(-0.5, 0.5, 2 * SR).astype(np.float32)
+        path = self.tmp / "mono.wav"
+        sf.write(str(path), audio, SR, subtype="FLOAT")
+
+        blocks, expected_samples = engine._open_stream(str(path), SR)
+        streamed = np.concatenate(list(blocks), axis=1)
+
+        self.assertEqual(expected_samples, audio.size)
+        np.testing.assert_array_equal(streamed, np.stack([audio, audio]))
+
+
+class ModelCacheTest(unittest.TestCase):
+    def tearDown(self):
+        audio_splitter._MODEL_CACHE.pop("stub", None)
+        audio_splitter._MODEL_USERS.pop("stub", None)
+
+    def test_weights_outlive_all_but_the_last_release(self):
+        # Seeded so _get_model doesn't try to load real weights
+        model = audio_splitter._MODEL_CACHE["stub"] = object()
+        self.assertIs(audio_splitter._get_model("stub"), model)
+        self.assertIs(audio_splitter._get_model("stub"), model)
+
+        audio_splitter._release_model("stub")
+        self.assertIs(audio_splitter._MODEL_CACHE.get("stub"), model)
+        audio_splitter._release_model("stub")
+        self.assertNotIn("stub", audio_splitter._MODEL_CACHE)
+        self.assertNotIn("stub", audio_splitter._MODEL_USERS)
+
+
+if __name__ == "__main__":
+    unittest.main()